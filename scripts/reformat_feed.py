@@ -14,10 +14,16 @@ Fixes:
 
 import base64
 import csv
+import functools
+import os
 import zlib
 from pathlib import Path
 
+# Every Lofty/Chime proxy photo URL starts with this
+CHIME_PREFIX = "https://img.chime.me/"
 
+
+@functools.lru_cache(maxsize=65536)
 def decode_chime_image_url(chime_url: str) -> str:
     """Decode an img.chime.me imageemb proxy URL to its stable CDN source URL.
 
@@ -28,16 +34,14 @@ def decode_chime_image_url(chime_url: str) -> str:
     The decoded sparkplatform URLs are permanent CDN assets (keyed by upload
     timestamp) that return 200 with no authentication required.
     """
-    if not chime_url or "img.chime.me" not in chime_url:
+    if not chime_url or not chime_url.startswith(CHIME_PREFIX):
         return chime_url
     try:
-        parts = chime_url.rstrip(".jpg").split("original_", 1)
-        if len(parts) != 2:
+        _, sep, token = chime_url.partition("original_")
+        if not sep:
             return chime_url
-        token = parts[1]
-        token_std = token.replace("-", "+").replace("_", "/")
-        token_std += "=" * (4 - len(token_std) % 4)
-        compressed = base64.b64decode(token_std)
+        token = token.removesuffix(".jpg")
+        compressed = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
         return zlib.decompress(compressed, -15).decode("utf-8")
     except Exception:
         return chime_url
@@ -63,6 +67,9 @@ def optimize_image_url(url: str) -> str:
 FEED_PATH = Path(__file__).resolve().parent.parent / "docs" / "feed.csv"
 OUTPUT_PATH = FEED_PATH  # overwrite in place
 
+# 1 MiB file buffers: far fewer read/write syscalls than the 8 KiB default
+IO_BUFFER_SIZE = 1 << 20
+
 # Support both old snake_case and new Title Case headers
 HEADER_MAP_SNAKE = {
     "listing_id": "Listing ID",
@@ -84,20 +91,33 @@ GOOGLE_HEADERS = list(HEADER_MAP_SNAKE.values())
 HEADER_MAP_TITLE = {v: v for v in GOOGLE_HEADERS}
 
 
-def _get(row: dict, snake_key: str, title_key: str, default: str = "") -> str:
-    """Get value from row supporting both header formats."""
-    return row.get(snake_key, row.get(title_key, default))
+def _resolve_columns(header: list[str]) -> list[int]:
+    """Return the source column index for each Google header, in header order.
+
+    Resolved once from the header row so the per-row loop indexes the row
+    list directly instead of probing both header formats.  Columns absent
+    from the file point one past the last real column, which the caller pads
+    with an empty string.
+    """
+    idx = {h: i for i, h in enumerate(header)}
+    missing = len(header)
+    return [
+        idx.get(snake_key, idx.get(title_key, missing))
+        for snake_key, title_key in HEADER_MAP_SNAKE.items()
+    ]
 
 
 def truncate_listing_name(name: str) -> str:
     """Truncate listing name to 25 chars, dropping city part first."""
     if len(name) <= 25:
         return name
-    if " in " in name:
-        name = name[: name.rfind(" in ")]
-    if len(name) <= 25:
-        return name
-    return name[:25]
+    # Cutting at the last " in " fits exactly when it starts within 25 chars
+    cut = name.rfind(" in ")
+    return name[:cut] if -1 < cut <= 25 else name[:25]
+
+
+# City values repeat across the whole feed — lowercase each one only once
+_city_lc_cache: dict[str, str] = {}
 
 
 def fix_address(address: str, city: str) -> str:
@@ -105,10 +125,13 @@ def fix_address(address: str, city: str) -> str:
     if not address:
         return ""
     # Already has city appended (contains comma with city name)
-    if city and city.lower() in address.lower():
-        return address
-    # Append city, CA
     if city:
+        city_lc = _city_lc_cache.get(city)
+        if city_lc is None:
+            city_lc = _city_lc_cache[city] = city.lower()
+        if city_lc in address.lower():
+            return address
+        # Append city, CA
         return f"{address}, {city}, CA"
     return address
 
@@ -132,57 +155,87 @@ def fix_description(desc: str) -> str:
     """Truncate to 25 chars and fix excessive capitalization."""
     desc = desc[:25]
     # Google disapproves excessive caps — title case if >50% uppercase
-    if desc and sum(1 for c in desc if c.isupper()) > len(desc) * 0.5:
+    if desc and sum(map(str.isupper, desc)) > len(desc) * 0.5:
         desc = desc.title()
     return desc
 
 
 def fix_contextual_keywords(kw: str) -> str:
     """Replace comma separators with semicolons."""
-    return "; ".join(part.strip() for part in kw.split(",") if part.strip())
+    # Strip each fragment once (not twice) and join a list, not a generator
+    return "; ".join([part for part in map(str.strip, kw.split(",")) if part])
 
 
 def main():
-    rows = []
-    with open(FEED_PATH, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rows.append(row)
-
-    print(f"Read {len(rows)} rows from {FEED_PATH}")
-
-    with open(OUTPUT_PATH, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=GOOGLE_HEADERS)
-        writer.writeheader()
-
-        skipped = 0
-        for row in rows:
-            name = _get(row, "listing_name", "Listing name")
-            if name.startswith("-"):
-                skipped += 1
-                continue
-
-            city = _get(row, "city_name", "City name")
-            address = _get(row, "address", "Address")
-
-            mapped = {
-                "Listing ID": _get(row, "listing_id", "Listing ID"),
-                "Listing name": truncate_listing_name(name),
-                "Final URL": _get(row, "final_url", "Final URL"),
-                "Image URL": optimize_image_url(_get(row, "image_url", "Image URL")),
-                "Price": format_price(_get(row, "price", "Price")),
-                "City name": city[:25],
-                "Property type": _get(row, "property_type", "Property type"),
-                "Listing type": _get(row, "listing_type", "Listing type") or "For Sale",
-                "Address": fix_address(address, city),
-                "Description": fix_description(_get(row, "description", "Description")),
-                "Contextual keywords": fix_contextual_keywords(
-                    _get(row, "contextual_keywords", "Contextual keywords")
-                ),
-            }
-            writer.writerow(mapped)
-
-    written = len(rows) - skipped
+    # Stream rows straight through to a temp file, then swap it into place —
+    # input and output are the same path, so this keeps the overwrite atomic.
+    tmp_path = OUTPUT_PATH.with_suffix(".csv.tmp")
+    skipped = 0
+    written = 0
+    with (
+        open(FEED_PATH, newline="", encoding="utf-8", buffering=IO_BUFFER_SIZE) as src,
+        open(tmp_path, "w", newline="", encoding="utf-8", buffering=IO_BUFFER_SIZE) as dst,
+    ):
+        reader = csv.reader(src)
+        header = next(reader, [])
+        columns = _resolve_columns(header)
+        (
+            id_i,
+            name_i,
+            url_i,
+            image_i,
+            price_i,
+            city_i,
+            ptype_i,
+            ltype_i,
+            address_i,
+            desc_i,
+            kw_i,
+        ) = columns
+        # Short rows (and absent columns) read as ""
+        width = max(columns) + 1
+
+        writer = csv.writer(dst)
+        writer.writerow(GOOGLE_HEADERS)
+
+        def _rows():
+            nonlocal skipped, written
+            for row in reader:
+                if not row:
+                    continue  # blank line, as DictReader skips
+                if len(row) < width:
+                    row += [""] * (width - len(row))
+
+                name = row[name_i]
+                if name.startswith("-"):
+                    skipped += 1
+                    continue
+
+                city = row[city_i]
+                address = row[address_i]
+
+                written += 1
+                # Values in GOOGLE_HEADERS order
+                yield (
+                    row[id_i],
+                    truncate_listing_name(name),
+                    row[url_i],
+                    optimize_image_url(row[image_i]),
+                    format_price(row[price_i]),
+                    city[:25],
+                    row[ptype_i],
+                    row[ltype_i] or "For Sale",
+                    fix_address(address, city),
+                    fix_description(row[desc_i]),
+                    fix_contextual_keywords(row[kw_i]),
+                )
+
+        # writerows drives the generator from inside the _csv C loop
+        writer.writerows(_rows())
+
+    os.replace(tmp_path, OUTPUT_PATH)
+
+    print(f"Read {written + skipped} rows from {FEED_PATH}")
     print(f"Wrote {written} rows ({skipped} skipped for bad data)")
     print(f"Output: {OUTPUT_PATH}")
 
@@ -37,6 +37,7 @@ class StealthBrowser:
     def __init__(self) -> None:
         self._pw = None
         self._browser: Browser | None = None
+        self._context: BrowserContext | None = None
 
     async def start(self) -> None:
         self._pw = await async_playwright().start()
@@ -47,9 +48,15 @@ class StealthBrowser:
                 "--no-sandbox",
             ],
         )
+        # Shared context for new_page(); context creation is the expensive part
+        self._context = await self.new_context()
         logger.info("Browser started (headless={})", settings.headless)
 
     async def new_context(self) -> BrowserContext:
+        """Create an isolated context (own cookies, UA, viewport).
+
+        Use only when isolation is required — new_page() reuses a shared one.
+        """
         viewport = random.choice(VIEWPORTS)
         ua = random.choice(USER_AGENTS)
         ctx = await self._browser.new_context(
@@ -62,10 +69,12 @@ class StealthBrowser:
         return ctx
 
     async def new_page(self) -> Page:
-        ctx = await self.new_context()
-        return await ctx.new_page()
+        """Open a page in the shared context. Close it with page.close()."""
+        return await self._context.new_page()
 
     async def close(self) -> None:
+        if self._context:
+            await self._context.close()
         if self._browser:
             await self._browser.close()
         if self._pw:
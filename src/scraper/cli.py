@@ -97,13 +97,16 @@ async def _run_pipeline() -> None:
         for listing in listings:
             state.update(listing)
 
-        # Generate feed
-        count = write_feed(listings)
-        logger.info("Feed generated with {} active listings", count)
+        # Generate feed on a worker thread so it overlaps the state save and
+        # browser shutdown (write_feed only reads the listings and settings)
+        feed_task = asyncio.create_task(asyncio.to_thread(write_feed, listings))
 
-        # Save state
+        # Save state before the browser closes, so a shutdown error can't lose it
         state.save()
 
+    count = await feed_task
+    logger.info("Feed generated with {} active listings", count)
+
 
 @app.command()
 def test_extract(
@@ -123,7 +126,7 @@ def test_extract(
                 rprint(listing.model_dump())
             else:
                 logger.error("Extraction returned None")
-            await page.context.close()
+            await page.close()
 
     asyncio.run(_test())
 
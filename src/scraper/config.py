@@ -1,5 +1,6 @@
 """Configuration via environment variables."""
 
+from functools import cached_property
 from pathlib import Path
 
 from pydantic_settings import BaseSettings
@@ -21,11 +22,12 @@ class Settings(BaseSettings):
     feed_path: Path = Path("docs/feed.csv")
     state_path: Path = Path("state/listings.json")
 
-    @property
+    # Paths are fixed for the life of the process; compute them once
+    @cached_property
     def abs_feed_path(self) -> Path:
         return self.project_root / self.feed_path
 
-    @property
+    @cached_property
     def abs_state_path(self) -> Path:
         return self.project_root / self.state_path
 
@@ -5,8 +5,13 @@ session, then paginate through the search API to get all active listings
 with full data (no need to visit individual detail pages).
 """
 
+import asyncio
 import json
+import math
+import re
+from urllib.parse import urljoin
 
+import orjson
 from loguru import logger
 from playwright.async_api import Page
 
@@ -53,8 +58,22 @@ SEARCH_CONDITION = {
     "propertyType": PROPERTY_TYPES,
 }
 
+# The condition never changes between pages — serialize it once
+CONDITION_JSON = json.dumps(SEARCH_CONDITION, separators=(",", ":"))
+
 PAGE_SIZE = 100
 
+API_PATH = "/api-site/search/realTimeListings"
+API_HEADERS = {
+    "accept": "application/json",
+    "currentsiteid": "128008",
+    "site-search-listings": "true",
+}
+
+# Strip HTML tags and collapse whitespace in listing descriptions
+_TAG_RE = re.compile(r"<[^>]*>")
+_WS_RE = re.compile(r"\s+")
+
 
 async def discover_and_extract(browser: StealthBrowser) -> list[Listing]:
     """Navigate to a CAPTCHA-free page, then paginate the search API.
@@ -75,125 +94,144 @@ async def discover_and_extract(browser: StealthBrowser) -> list[Listing]:
         await human_delay(1.0)
     except Exception as e:
         logger.error("Failed to establish session: {}", e)
-        await page.context.close()
+        await page.close()
         return []
 
-    # Step 2: Paginate the search API
+    # Step 2: Fetch page 1 to learn the total, then the rest concurrently
     logger.info("Querying Lofty search API (pageSize={})", PAGE_SIZE)
-    all_listings: list[Listing] = []
-    current_page = 1
-
-    while True:
-        batch = await _fetch_page(page, current_page)
-        if not batch:
-            break
-
-        all_listings.extend(batch)
-        logger.info(
-            "Page {}: got {} listings (total: {})", current_page, len(batch), len(all_listings)
-        )
-
-        if len(batch) < PAGE_SIZE:
-            break
-        if settings.max_listings and len(all_listings) >= settings.max_listings:
-            all_listings = all_listings[: settings.max_listings]
-            break
+    all_listings, total, n_items = await _fetch_page(page, 1)
+    logger.info("Page 1: got {} listings", len(all_listings))
+
+    if total:
+        if settings.max_listings:
+            total = min(total, settings.max_listings)
+        n_pages = math.ceil(total / PAGE_SIZE)
+        if n_pages > 1:
+            sem = asyncio.Semaphore(settings.concurrency)
+
+            async def _fetch_page_limited(page_num: int) -> list[Listing]:
+                # Delay inside the semaphore so pacing holds per request slot
+                async with sem:
+                    await human_delay(0.5)
+                    batch, _, _ = await _fetch_page(page, page_num)
+                logger.info("Page {}: got {} listings", page_num, len(batch))
+                return batch
+
+            # gather() preserves page order regardless of completion order
+            batches = await asyncio.gather(
+                *[_fetch_page_limited(n) for n in range(2, n_pages + 1)]
+            )
+            for batch in batches:
+                all_listings.extend(batch)
+    else:
+        # No usable total: page sequentially until a short page.  Judge
+        # "short" by the raw item count, so dropped id-less items don't stop it
+        current_page = 1
+        while n_items == PAGE_SIZE:
+            if settings.max_listings and len(all_listings) >= settings.max_listings:
+                break
+            current_page += 1
+            await human_delay(0.5)
+            batch, _, n_items = await _fetch_page(page, current_page)
+            all_listings.extend(batch)
+            logger.info(
+                "Page {}: got {} listings (total: {})",
+                current_page,
+                len(batch),
+                len(all_listings),
+            )
 
-        current_page += 1
-        await human_delay(0.5)
+    if settings.max_listings:
+        del all_listings[settings.max_listings :]  # trim in place, no copy
 
-    await page.context.close()
+    await page.close()
     logger.info("Discovered {} total listings via API", len(all_listings))
     return all_listings
 
 
-async def _fetch_page(page: Page, page_num: int) -> list[Listing]:
-    """Fetch one page of listings from the Lofty search API."""
-    try:
-        result = await page.evaluate(
-            """
-            async ([condition, pageSize, pageNum]) => {
-                const params = new URLSearchParams({
-                    condition: JSON.stringify(condition),
-                    cache: 'false',
-                    timezone: 'GMT+0000',
-                    pageSize: String(pageSize),
-                    page: String(pageNum),
-                    listingSort: 'MLS_LIST_DATE_L_DESC',
-                });
-                const resp = await fetch(
-                    `/api-site/search/realTimeListings?${params}`,
-                    {
-                        headers: {
-                            'accept': 'application/json',
-                            'currentsiteid': '128008',
-                            'site-search-listings': 'true',
-                        },
-                    }
-                );
-                if (!resp.ok) return { error: resp.status };
-                const data = await resp.json();
-                return {
-                    listings: (data.listings || []).map(l => ({
-                        id: l.id,
-                        mlsId: l.mlsListingId || '',
-                        price: l.price || 0,
-                        bedrooms: l.bedrooms || 0,
-                        bathrooms: l.bathrooms || 0,
-                        sqft: l.sqft || 0,
-                        propertyType: l.propertyType || '',
-                        status: l.flag || l.openHouseDesc || 'Active',
-                        street: l.streetAddress || '',
-                        city: l.city || '',
-                        state: l.state || 'CA',
-                        zip: l.zipCode || '',
-                        image: l.previewPicture || '',
-                        description: (l.detailsDescribe || '').replace(/<[^>]*>/g, ' ').replace(/\\s+/g, ' ').trim().substring(0, 300),
-                        detailUrl: l.detailUrl || '',
-                        subdivision: l.subDivisionName || l.neighborhoodName || '',
-                    })),
-                    total: data.counts,
-                };
-            }
-        """,
-            [SEARCH_CONDITION, PAGE_SIZE, page_num],
-        )
+async def _fetch_page(page: Page, page_num: int) -> tuple[list[Listing], int, int]:
+    """Fetch one page of listings from the Lofty search API.
 
-        if "error" in result:
-            logger.error("API returned status {}", result["error"])
-            return []
+    Uses the page's APIRequestContext, which shares the browser session's
+    cookies but skips the JS VM and CDP marshalling of an in-page fetch().
 
+    Returns the page's listings, the total listing count reported by the API
+    (0 when it reports no usable count), and the number of raw items on the
+    page before id-less ones are dropped.
+    """
+    try:
+        resp = await page.request.get(
+            # Same origin the session page ended up on (after any redirect),
+            # like the old in-page relative fetch, so its cookies are sent
+            urljoin(page.url, API_PATH),
+            params={
+                "condition": CONDITION_JSON,
+                "cache": "false",
+                "timezone": "GMT+0000",
+                "pageSize": str(PAGE_SIZE),
+                "page": str(page_num),
+                "listingSort": "MLS_LIST_DATE_L_DESC",
+            },
+            headers={**API_HEADERS, "referer": page.url},
+        )
+        if not resp.ok:
+            logger.error("API returned status {}", resp.status)
+            return [], 0, 0
+        data = orjson.loads(await resp.body())
+
+        # counts may be missing, null or a numeric string; 0 means unknown
+        try:
+            total = int(data.get("counts") or 0)
+        except (TypeError, ValueError):
+            total = 0
         if page_num == 1:
-            logger.info("Total listings available: {}", result.get("total", "?"))
+            if total:
+                logger.info("Total listings available: {}", total)
+            else:
+                logger.warning("API did not report a total; paging until a short page")
 
         listings = []
-        for item in result.get("listings", []):
+        items = data.get("listings") or []
+        for item in items:
             if not item.get("id"):
                 continue
-            detail_url = item["detailUrl"]
+            detail_url = item.get("detailUrl") or ""
             if detail_url and not detail_url.startswith("http"):
                 detail_url = f"{settings.base_url}{detail_url}"
 
+            # state always has a value (defaults to CA); only zip may be missing
+            city = item.get("city") or ""
+            state = item.get("state") or "CA"
+            zip_code = item.get("zipCode") or ""
+            city_full = f"{city}, {state} {zip_code}" if zip_code else f"{city}, {state}"
+
+            description = _TAG_RE.sub(" ", item.get("detailsDescribe") or "")
+            description = _WS_RE.sub(" ", description).strip()[:300]
+
+            # model_construct skips validation: this mapping is the source of
+            # truth for field types, so coerce anything non-string here
             listings.append(
-                Listing(
+                Listing.model_construct(
                     url=detail_url,
                     lofty_id=str(item["id"]),
-                    mls_id=item["mlsId"],
-                    price=item["price"],
-                    bedrooms=item["bedrooms"],
-                    bathrooms=item["bathrooms"],
-                    sqft=item["sqft"],
-                    property_type=item["propertyType"],
-                    status=item["status"] or "Active",
-                    address=item["street"],
-                    city=f"{item['city']}, {item['state']} {item['zip']}".strip(),
-                    image_url=optimize_image_url(item["image"]),
-                    description=item["description"],
-                    subdivision=item["subdivision"],
+                    mls_id=str(item.get("mlsListingId") or ""),
+                    price=float(item.get("price") or 0),
+                    bedrooms=int(item.get("bedrooms") or 0),
+                    bathrooms=int(item.get("bathrooms") or 0),
+                    sqft=int(item.get("sqft") or 0),
+                    property_type=item.get("propertyType") or "",
+                    status=item.get("flag") or item.get("openHouseDesc") or "Active",
+                    address=item.get("streetAddress") or "",
+                    city=city_full,
+                    image_url=optimize_image_url(item.get("previewPicture") or ""),
+                    description=description,
+                    subdivision=(
+                        item.get("subDivisionName") or item.get("neighborhoodName") or ""
+                    ),
                 )
             )
-        return listings
+        return listings, total, len(items)
 
     except Exception as e:
         logger.error("Failed to fetch page {}: {}", page_num, e)
-        return []
+        return [], 0, 0
@@ -1,7 +1,7 @@
 """Extract listing data from a detail page: JSON-LD first, DOM fallback."""
 
 import base64
-import json
+import functools
 import re
 import zlib
 
@@ -11,7 +11,101 @@ from playwright.async_api import Page
 from scraper.browser import human_delay
 from scraper.models import Listing
 
-
+try:
+    from deflate import deflate_decompress
+except ImportError:  # no libdeflate wheel for this platform — zlib is fine, just slower
+    deflate_decompress = None
+
+# Every Lofty/Chime proxy photo URL starts with this
+_CHIME_PREFIX = "https://img.chime.me/"
+
+# Output bound for libdeflate's one-shot decode; photo URLs are far shorter
+_MAX_DECODED_URL_BYTES = 4096
+
+# Characters dropped by _parse_price / _int.  The translate tables cover
+# Latin-1 (incl. NBSP) in one C pass; anything wider falls back to the regex.
+_DROP_NONDIGIT = {c: None for c in range(256) if not "0" <= chr(c) <= "9"}
+_DROP_NONPRICE = {c: None for c in range(256) if not ("0" <= chr(c) <= "9" or chr(c) == ".")}
+_PRICE_RE = re.compile(r"[^\d.]")
+_INT_RE = re.compile(r"[^\d]")
+
+# Selectors used from Python (Playwright waits / clicks)
+_SEL_PRICE = ".price-number"
+_SEL_ADDRESS = "h1.address-container .street"
+_SEL_MODAL_CLOSE = '[class*="modal"] [class*="close"], .modal-close, [aria-label="Close"]'
+
+# Single-round-trip page read: JSON-LD and DOM are merged in-page (JSON-LD
+# first, DOM fallback), plus Key Details.  Prices come back as both raw
+# strings so _parse_price decides which one is usable.
+# Kept as one constant string so every listing sends the identical script.
+_EXTRACT_JS = """
+() => {
+    const SEL = {
+        jsonld: 'script[type="application/ld+json"]',
+        street: '.address-container .street',
+        city: '.address-container .city',
+        status: '.house-status .status-text',
+        beds: '.bed-count .number',
+        baths: '.bath-count .number',
+        sqft: '.sqft-count .number',
+        price: '.price-number',
+        image: '.slide-left .img-content img',
+        description: '.read-more-content .info-data',
+        keyTitle: '.info-title',
+    };
+    const txt = (sel) => {
+        const el = document.querySelector(sel);
+        return el ? (el.textContent || '').trim() : '';
+    };
+    const attr = (sel, a) => {
+        const el = document.querySelector(sel);
+        return el ? el.getAttribute(a) || '' : '';
+    };
+    // First Product-type JSON-LD block; both [{...}] and {...} wrappings.
+    // Blocks that can't contain a Product (Organization, ...) aren't parsed.
+    const product = [...document.querySelectorAll(SEL.jsonld)]
+        .map(s => s.textContent || '')
+        .filter(t => t.includes('Product'))
+        .flatMap(t => { try { return [JSON.parse(t)]; } catch { return []; } })
+        .flat()
+        .find(x => x && x['@type'] === 'Product') || {};
+    const str = (v) => (typeof v === 'string' ? v : '');
+    const offer = [].concat(product.offers || [])[0] || {};
+    const keyDetails = {};
+    document.querySelectorAll(SEL.keyTitle).forEach(el => {
+        const key = el.textContent.trim();
+        const val = el.nextElementSibling;
+        if (val && val.classList.contains('info-data')) {
+            keyDetails[key] = val.textContent.trim();
+        }
+    });
+    return {
+        // JSON-LD name often has duplicated city — DOM street wins
+        address: txt(SEL.street) || str(product.name),
+        city: txt(SEL.city),
+        status: txt(SEL.status),
+        beds: txt(SEL.beds),
+        baths: txt(SEL.baths),
+        sqft: txt(SEL.sqft),
+        jsonldPrice: String(offer.price ?? ''),
+        domPrice: txt(SEL.price),
+        image: str(product.image) || attr(SEL.image, 'src'),
+        description: txt(SEL.description),
+        keyDetails,
+    };
+}
+"""
+
+
+def _inflate_raw(data: bytes) -> bytes:
+    """Decompress a raw-deflate (headerless) buffer."""
+    if deflate_decompress is not None:
+        return bytes(deflate_decompress(data, _MAX_DECODED_URL_BYTES))
+    # wbits=-15 skips the zlib header
+    return zlib.decompress(data, -15)
+
+
+@functools.lru_cache(maxsize=65536)
 def decode_chime_image_url(chime_url: str) -> str:
     """Decode an img.chime.me imageemb URL to its underlying stable CDN URL.
 
@@ -28,23 +122,23 @@ def decode_chime_image_url(chime_url: str) -> str:
     image feeds.  The decoded sparkplatform URLs return 200 with no auth.
 
     Returns the decoded URL if decoding succeeds, or the original chime_url
-    unchanged so callers always get a non-empty string.
+    unchanged so callers always get a non-empty string.  Results are memoized:
+    the same URL is decoded again by needs_download().
     """
-    if not chime_url or "img.chime.me" not in chime_url:
+    if not chime_url or not chime_url.startswith(_CHIME_PREFIX):
         return chime_url
     try:
-        # Split on 'original_' to isolate the token, strip trailing .jpg
-        parts = chime_url.rstrip(".jpg").split("original_", 1)
-        if len(parts) != 2:
+        # Token is everything after 'original_', minus the .jpg suffix
+        # (removesuffix, not rstrip: rstrip(".jpg") also ate token chars j/p/g)
+        _, sep, token = chime_url.partition("original_")
+        if not sep:
             return chime_url
-        token = parts[1]
-        # URL-safe base64 -> standard base64
-        token_std = token.replace("-", "+").replace("_", "/")
-        # Pad to 4-byte boundary
-        token_std += "=" * (4 - len(token_std) % 4)
-        compressed = base64.b64decode(token_std)
-        # Raw deflate (wbits=-15 skips the zlib header)
-        decoded_url = zlib.decompress(compressed, -15).decode("utf-8")
+        token = token.removesuffix(".jpg")
+        # URL-safe base64 (decoded natively, no -_ -> +/ rewrite), padded to
+        # a 4-byte boundary
+        compressed = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        # Raw deflate (no zlib header)
+        decoded_url = _inflate_raw(compressed).decode("utf-8")
         return decoded_url
     except Exception as e:
         logger.debug("Failed to decode chime image URL {}: {}", chime_url, e)
@@ -76,12 +170,10 @@ async def extract_listing(page: Page, url: str) -> Listing | None:
     try:
         await page.goto(url, wait_until="domcontentloaded", timeout=45_000)
         # Wait for the price element in DOM (not visibility — overlays may block)
-        await page.wait_for_selector(".price-number", state="attached", timeout=30_000)
+        await page.wait_for_selector(_SEL_PRICE, state="attached", timeout=30_000)
         # Dismiss any registration modal that may appear
         try:
-            close_btn = await page.query_selector(
-                '[class*="modal"] [class*="close"], .modal-close, [aria-label="Close"]'
-            )
+            close_btn = await page.query_selector(_SEL_MODAL_CLOSE)
             if close_btn:
                 await close_btn.click()
         except Exception:
@@ -94,63 +186,28 @@ async def extract_listing(page: Page, url: str) -> Listing | None:
     try:
         listing = Listing(url=url)
 
-        # --- Phase 1: JSON-LD extraction ---
-        jsonld = await _extract_jsonld(page)
-        if jsonld:
-            listing.price = _parse_price(jsonld.get("offers", {}).get("price", ""))
-            listing.image_url = optimize_image_url(jsonld.get("image", ""))
-            # JSON-LD name often has duplicated city — prefer DOM address below
-            name = jsonld.get("name", "")
-
-        # --- Phase 2: DOM extraction (fills gaps + overrides) ---
         # Wait for address to render (h1 with address-container class)
         try:
-            await page.wait_for_selector("h1.address-container .street", state="attached", timeout=10_000)
+            await page.wait_for_selector(_SEL_ADDRESS, state="attached", timeout=10_000)
         except Exception:
             pass
-        # Use evaluate() for all DOM reads in a single call to avoid race conditions
-        dom = await page.evaluate("""
-            () => {
-                const txt = (sel) => {
-                    const el = document.querySelector(sel);
-                    return el ? (el.textContent || '').trim() : '';
-                };
-                const attr = (sel, a) => {
-                    const el = document.querySelector(sel);
-                    return el ? el.getAttribute(a) || '' : '';
-                };
-                return {
-                    street: txt('.address-container .street'),
-                    city: txt('.address-container .city'),
-                    status: txt('.house-status .status-text'),
-                    beds: txt('.bed-count .number'),
-                    baths: txt('.bath-count .number'),
-                    sqft: txt('.sqft-count .number'),
-                    price: txt('.price-number'),
-                    image: attr('.slide-left .img-content img', 'src'),
-                    description: txt('.read-more-content .info-data'),
-                };
-            }
-        """)
-
-        listing.address = dom.get("street") or name or ""
-        listing.city = dom.get("city", "")
-        listing.status = dom.get("status", "")
-        listing.bedrooms = _int(dom.get("beds"))
-        listing.bathrooms = _int(dom.get("baths"))
-        listing.sqft = _int(dom.get("sqft"))
-
-        if not listing.price:
-            listing.price = _parse_price(dom.get("price"))
-
-        if not listing.image_url:
-            listing.image_url = optimize_image_url(dom.get("image", ""))
-
-        if dom.get("description"):
-            listing.description = dom["description"]
+        # One evaluate() returns the merged JSON-LD/DOM fields and Key
+        # Details: a single CDP round-trip, no race between separate reads
+        raw = await page.evaluate(_EXTRACT_JS)
+
+        listing.address = raw["address"]
+        listing.city = raw["city"]
+        listing.status = raw["status"]
+        listing.bedrooms = _int(raw["beds"])
+        listing.bathrooms = _int(raw["baths"])
+        listing.sqft = _int(raw["sqft"])
+        listing.price = _parse_price(raw["jsonldPrice"]) or _parse_price(raw["domPrice"])
+        listing.image_url = optimize_image_url(raw["image"])
+        if raw["description"]:
+            listing.description = raw["description"]
 
         # Key Details section (MLS ID, Property Type, Subdivision)
-        key_details = await _extract_key_details(page)
+        key_details = raw["keyDetails"]
         listing.mls_id = key_details.get("MLS Listing ID", "")
         listing.property_type = key_details.get("Property Type", "")
         listing.subdivision = key_details.get("Subdivision", "")
@@ -169,52 +226,13 @@ async def extract_listing(page: Page, url: str) -> Listing | None:
         return None
 
 
-async def _extract_jsonld(page: Page) -> dict | None:
-    """Parse the first Product-type JSON-LD block (handles array wrapping)."""
-    scripts = await page.query_selector_all('script[type="application/ld+json"]')
-    for script in scripts:
-        try:
-            text = await script.inner_text()
-            data = json.loads(text)
-            # Handle both [{...}] and {...} formats
-            if isinstance(data, list):
-                for item in data:
-                    if isinstance(item, dict) and item.get("@type") == "Product":
-                        return item
-            elif isinstance(data, dict) and data.get("@type") == "Product":
-                return data
-        except (json.JSONDecodeError, Exception):
-            continue
-    return None
-
-
-async def _extract_key_details(page: Page) -> dict[str, str]:
-    """Extract key-value pairs from the Key Details section."""
-    try:
-        pairs = await page.evaluate("""
-            () => {
-                const out = {};
-                document.querySelectorAll('.info-title').forEach(el => {
-                    const key = el.textContent.trim();
-                    const val = el.nextElementSibling;
-                    if (val && val.classList.contains('info-data')) {
-                        out[key] = val.textContent.trim();
-                    }
-                });
-                return out;
-            }
-        """)
-        return pairs or {}
-    except Exception as e:
-        logger.debug("Key details extraction failed: {}", e)
-        return {}
-
-
 def _parse_price(raw: str | None) -> float:
     """Parse price string like '$ 575,000' or '575000' to float."""
     if not raw:
         return 0.0
-    digits = re.sub(r"[^\d.]", "", raw)
+    digits = raw.translate(_DROP_NONPRICE)
+    if not digits.isascii():
+        digits = _PRICE_RE.sub("", digits)
     try:
         return float(digits)
     except ValueError:
@@ -225,7 +243,9 @@ def _int(raw: str | None) -> int:
     """Parse a number string like '1,833' to int."""
     if not raw:
         return 0
-    digits = re.sub(r"[^\d]", "", raw)
+    digits = raw.translate(_DROP_NONDIGIT)
+    if not digits.isascii():
+        digits = _INT_RE.sub("", digits)
     try:
         return int(digits)
     except ValueError:
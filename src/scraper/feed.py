@@ -1,11 +1,14 @@
 """Generate Google Ads DynamicRealEstateAsset CSV feed."""
 
 import csv
+import html
+import os
+import re
 
 from loguru import logger
 
 from scraper.config import settings
-from scraper.models import FeedRow, Listing
+from scraper.models import Listing
 
 # Google Ads requires Title Case headers with spaces
 FEED_COLUMNS = [
@@ -22,20 +25,49 @@ FEED_COLUMNS = [
     "Contextual keywords",
 ]
 
-# Map from FeedRow field names to Google Ads header names
-_FIELD_TO_HEADER = {
-    "listing_id": "Listing ID",
-    "listing_name": "Listing name",
-    "final_url": "Final URL",
-    "image_url": "Image URL",
-    "price": "Price",
-    "city_name": "City name",
-    "property_type": "Property type",
-    "listing_type": "Listing type",
-    "address": "Address",
-    "description": "Description",
-    "contextual_keywords": "Contextual keywords",
-}
+# Anything outside printable ASCII is dropped from descriptions
+_NON_PRINTABLE_RE = re.compile(r"[^\x20-\x7E]")
+
+
+def _listing_to_row(listing: Listing) -> tuple[str, ...]:
+    """Format a listing as a feed row, values in FEED_COLUMNS order."""
+    keywords = []
+    if listing.subdivision:
+        keywords.append(listing.subdivision)
+    if listing.sqft and listing.sqft > 0:
+        keywords.append(f"{listing.sqft} sqft")
+
+    desc = ""
+    if listing.description:
+        desc = listing.description.replace("\n", " ").replace("\r", " ").strip()
+        # Decode HTML entities (&#128160; etc.) and strip non-ASCII
+        desc = html.unescape(desc)
+        desc = _NON_PRINTABLE_RE.sub("", desc).strip()
+        desc = desc[:25]
+        # Google disapproves excessive capitalization — check alpha chars only
+        # (spaces/digits/punctuation dilute the ratio with the old check)
+        alpha = [c for c in desc if c.isalpha()]
+        if alpha and sum(1 for c in alpha if c.isupper()) > len(alpha) * 0.3:
+            desc = desc.title()
+
+    price = listing.price
+    return (
+        listing.lofty_id,
+        listing.listing_name,
+        listing.url,
+        listing.image_url,
+        f"${int(price):,}" if price == int(price) else f"${price:,.2f}",
+        listing.city_short[:25],
+        listing.property_type,
+        "For Sale",
+        (
+            f"{listing.address}, {listing.city}, {listing.state}"
+            if listing.address and listing.city
+            else listing.address
+        ),
+        desc,
+        "; ".join(keywords),
+    )
 
 
 def write_feed(listings: list[Listing]) -> int:
@@ -48,14 +80,14 @@ def write_feed(listings: list[Listing]) -> int:
     path = settings.abs_feed_path
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=FEED_COLUMNS)
-        writer.writeheader()
-        for listing in active:
-            row = FeedRow.from_listing(listing)
-            # Remap snake_case keys to Google Ads Title Case headers
-            mapped = {_FIELD_TO_HEADER[k]: v for k, v in row.model_dump().items()}
-            writer.writerow(mapped)
+    # Write to a temp file and swap it in, so the published feed is never
+    # seen half-written (the pipeline runs this on a worker thread)
+    tmp_path = path.with_suffix(".csv.tmp")
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FEED_COLUMNS)
+        writer.writerows(_listing_to_row(lst) for lst in active)
+    os.replace(tmp_path, path)
 
     logger.info("Wrote {} rows to {}", len(active), path)
     return len(active)
@@ -1,11 +1,16 @@
-"""Pydantic models for listings and feed rows."""
+"""Data models for listings and scrape state."""
 
-import html
 import re
+from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 
 from pydantic import BaseModel, Field
 
+# Lofty uses statuses like "Active", "New", "Open Sun 1PM-3PM", etc.
+# One alternation scan instead of six substring checks.
+_INACTIVE_RE = re.compile(r"sold|closed|pending|withdrawn|expired|cancelled")
+
 
 class Listing(BaseModel):
     """Raw scraped listing data."""
@@ -27,17 +32,24 @@ class Listing(BaseModel):
     subdivision: str = ""
     scraped_at: datetime = Field(default_factory=datetime.utcnow)
 
-    @property
+    # Derived values are computed once: a Listing is not modified after
+    # extraction apart from image_url, which neither depends on.
+    @cached_property
     def is_active(self) -> bool:
-        s = self.status.lower()
-        # Lofty uses statuses like "Active", "New", "Open Sun 1PM-3PM", etc.
-        inactive = ("sold", "closed", "pending", "withdrawn", "expired", "cancelled")
-        return bool(s) and not any(x in s for x in inactive)
+        s = self.status
+        if not s:
+            return False
+        return _INACTIVE_RE.search(s.lower()) is None
+
+    @cached_property
+    def city_short(self) -> str:
+        """City without state/zip: "Palm Desert, CA 92260" -> "Palm Desert"."""
+        return self.city.split(",", 1)[0].strip() if self.city else ""
 
-    @property
+    @cached_property
     def listing_name(self) -> str:
         """Human-readable name for feed, max 25 chars per Google Ads spec."""
-        city_short = self.city.split(",")[0].strip() if self.city else ""
+        city_short = self.city_short
         # Try full format: "3BR Condo in Palm Desert"
         parts = []
         if self.bedrooms and self.bedrooms > 0:
@@ -56,58 +68,13 @@ class Listing(BaseModel):
         return name or self.address[:25]
 
 
-class FeedRow(BaseModel):
-    """Google Ads DynamicRealEstateAsset CSV row."""
-
-    listing_id: str
-    listing_name: str
-    final_url: str
-    image_url: str
-    price: str  # "575000.00 USD"
-    city_name: str = ""
-    property_type: str = ""
-    listing_type: str = "For Sale"
-    address: str = ""
-    description: str = ""
-    contextual_keywords: str = ""
-
-    @classmethod
-    def from_listing(cls, listing: Listing) -> "FeedRow":
-        keywords = []
-        if listing.subdivision:
-            keywords.append(listing.subdivision)
-        if listing.sqft and listing.sqft > 0:
-            keywords.append(f"{listing.sqft} sqft")
-
-        desc = ""
-        if listing.description:
-            desc = listing.description.replace("\n", " ").replace("\r", " ").strip()
-            # Decode HTML entities (&#128160; etc.) and strip non-ASCII
-            desc = html.unescape(desc)
-            desc = re.sub(r"[^\x20-\x7E]", "", desc).strip()
-            desc = desc[:25]
-            # Google disapproves excessive capitalization — check alpha chars only
-            # (spaces/digits/punctuation dilute the ratio with the old check)
-            alpha = [c for c in desc if c.isalpha()]
-            if alpha and sum(1 for c in alpha if c.isupper()) > len(alpha) * 0.3:
-                desc = desc.title()
-
-        return cls(
-            listing_id=listing.lofty_id,
-            listing_name=listing.listing_name,
-            final_url=listing.url,
-            image_url=listing.image_url,
-            price=f"${int(listing.price):,}" if listing.price == int(listing.price) else f"${listing.price:,.2f}",
-            city_name=listing.city.split(",")[0].strip()[:25] if listing.city else "",
-            property_type=listing.property_type,
-            address=f"{listing.address}, {listing.city}, {listing.state}" if listing.address and listing.city else listing.address,
-            description=desc,
-            contextual_keywords="; ".join(keywords),
-        )
-
+@dataclass(slots=True, kw_only=True)
+class StateEntry:
+    """Per-listing state for incremental scraping.
 
-class StateEntry(BaseModel):
-    """Per-listing state for incremental scraping."""
+    A plain dataclass: entries are only built by StateManager from trusted
+    data, so they skip pydantic validation and dumping.
+    """
 
     url: str
     mls_id: str = ""
@@ -1,13 +1,29 @@
 """Incremental state management — skip recently scraped listings."""
 
-import json
 from datetime import datetime, timedelta
 
+import orjson
 from loguru import logger
 
 from scraper.config import settings
 from scraper.models import Listing, StateEntry
 
+# Statuses a listing never leaves — no point re-checking them
+_TERMINAL_STATES = frozenset({"sold", "closed", "withdrawn", "expired", "cancelled"})
+
+
+def _stale_cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(hours=settings.stale_hours)
+
+
+def _needs_scrape(entry: StateEntry | None, cutoff: datetime) -> bool | None:
+    """True if unseen or scraped before ``cutoff``; None if terminal (never re-scraped)."""
+    if not entry:
+        return True
+    if entry.status.lower() in _TERMINAL_STATES:
+        return None
+    return entry.last_scraped < cutoff
+
 
 class StateManager:
     """Track per-listing scrape timestamps for incremental runs."""
@@ -21,8 +37,11 @@ class StateManager:
         if not path.exists():
             return
         try:
-            data = json.loads(path.read_text())
+            data = orjson.loads(path.read_bytes())
             for url, entry in data.items():
+                # No validation on a dataclass — restore the non-JSON types here
+                entry["last_scraped"] = datetime.fromisoformat(entry["last_scraped"])
+                entry["last_price"] = float(entry.get("last_price", 0.0))
                 self._entries[url] = StateEntry(**entry)
             logger.info("Loaded state for {} listings", len(self._entries))
         except Exception as e:
@@ -31,22 +50,31 @@ class StateManager:
     def save(self) -> None:
         path = settings.abs_state_path
         path.parent.mkdir(parents=True, exist_ok=True)
-        data = {url: entry.model_dump(mode="json") for url, entry in self._entries.items()}
-        path.write_text(json.dumps(data, indent=2, default=str))
+        # orjson serializes dataclasses and datetimes natively (same ISO format)
+        path.write_bytes(orjson.dumps(self._entries, option=orjson.OPT_INDENT_2))
         logger.debug("Saved state for {} listings", len(self._entries))
 
     def is_stale(self, url: str) -> bool:
-        """True if URL needs re-scraping (not in state or older than stale_hours)."""
-        entry = self._entries.get(url)
-        if not entry:
-            return True
-        cutoff = datetime.utcnow() - timedelta(hours=settings.stale_hours)
-        return entry.last_scraped < cutoff
+        """True if URL needs re-scraping (not in state or older than stale_hours).
+
+        Listings last seen in a terminal status (sold, closed, ...) never are.
+        """
+        return bool(_needs_scrape(self._entries.get(url), _stale_cutoff()))
 
     def filter_stale(self, urls: list[str]) -> list[str]:
         """Return only URLs that need scraping."""
-        stale = [u for u in urls if self.is_stale(u)]
-        logger.info("{}/{} URLs need scraping", len(stale), len(urls))
+        cutoff = _stale_cutoff()
+        stale = []
+        terminal = 0
+        for u in urls:
+            needed = _needs_scrape(self._entries.get(u), cutoff)
+            if needed is None:
+                terminal += 1
+            elif needed:
+                stale.append(u)
+        logger.info(
+            "{}/{} URLs need scraping ({} skipped as terminal)", len(stale), len(urls), terminal
+        )
         return stale
 
     def update(self, listing: Listing) -> None:
@@ -61,4 +89,13 @@ class StateManager:
 
     def get_all_listings_data(self) -> list[dict]:
         """Return state data for all tracked listings."""
-        return [e.model_dump(mode="json") for e in self._entries.values()]
+        return [
+            {
+                "url": e.url,
+                "mls_id": e.mls_id,
+                "last_scraped": e.last_scraped.isoformat(),
+                "last_price": e.last_price,
+                "status": e.status,
+            }
+            for e in self._entries.values()
+        ]